@@ -3,18 +3,134 @@ Part Search Module for InteractiveHtmlBom
 Provides search functionality using BOM Parts Sourcing API server
 """
 
+import asyncio
+import functools
 import json
 import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
 import requests
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from requests.adapters import HTTPAdapter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import FrozenInstanceError, asdict, dataclass, fields
+from urllib3.util.retry import Retry
+
+_loads: Callable[[bytes], Any]
+_dumps: Callable[[Any], bytes]
+try:
+    # Optional, decodes API responses several times faster than json
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = "InteractiveHtmlBom-Enhanced"
+CONFIG_TTL = 600  # seconds
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "ibom", "parts.sqlite")
+DISK_CACHE_TTL = 24 * 60 * 60  # seconds
+# Outdated entries are kept for offline use, up to this age
+DISK_CACHE_MAX_AGE = 30 * 24 * 60 * 60  # seconds
+BATCH_FALLBACK_WORKERS = 8
+MAX_RETRY_AFTER = 30  # seconds
+
+# Seconds to connect to the API server and to wait for its response. The
+# server only answers once all suppliers did, hence the long read timeout,
+# while a server that isn't running fails fast.
+SEARCH_TIMEOUT = (5, 60)
+
+# Max number of requests in flight per supplier, keeps large BOM searches
+# under the supplier API rate limits
+DEFAULT_MAX_CONCURRENT = {"jlcpcb": 8, "digikey": 4, "mouser": 4}
+
+# Supplier ids as sent to the API server -> names results are keyed by
+SUPPLIER_NAMES = {"jlcpcb": "JLCPCB", "digikey": "Digi-Key", "mouser": "Mouser"}
+
+
+def _safe_int(value, default: int = 0) -> int:
+    """Convert an API stock value to int, default if it can't be parsed"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _safe_float(value, default: float = 0.0) -> float:
+    """Convert an API price value to float, default if it can't be parsed"""
+    try:
+        return float(str(value).replace(",", ""))
+    except (TypeError, ValueError):
+        return default
+
+
+def _jlcpcb_sort_key(comp: Dict) -> Tuple[int, float]:
+    """Rank JLCPCB components by highest stock, then lowest price"""
+    return (-_safe_int(comp.get("stock")), _safe_float(comp.get("price")))
+
+
+# slots=True is only accepted by dataclass() on Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _frozen_setattr(self, name, value):
+    raise FrozenInstanceError(f"cannot assign to field {name!r}")
 
-@dataclass
+
+def _frozen_delattr(self, name):
+    raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+
+def _slotted_getstate(self):
+    return [getattr(self, field.name) for field in fields(self)]
+
+
+def _slotted_setstate(self, state):
+    # Frozen instances can only be filled in through object.__setattr__
+    for field, value in zip(fields(self), state):
+        object.__setattr__(self, field.name, value)
+
+
+def _slotted(cls):
+    """
+    Rebuild a dataclass with __slots__ where dataclass() can't do it
+    
+    Field defaults would clash with slots of the same name, they are
+    already baked into __init__ so the class attributes can go. Without
+    a __dict__ copy and pickle need __getstate__/__setstate__, and the
+    frozen __setattr__/__delattr__ dataclass() generated refer to the
+    original class, so both are replaced as dataclass(slots=True) does.
+    """
+    if "__slots__" in cls.__dict__:
+        return cls
+    namespace = dict(cls.__dict__)
+    names = tuple(field.name for field in fields(cls))
+    for name in names + ("__dict__", "__weakref__"):
+        namespace.pop(name, None)
+    namespace["__slots__"] = names
+    namespace["__getstate__"] = _slotted_getstate
+    namespace["__setstate__"] = _slotted_setstate
+    if cls.__dataclass_params__.frozen:
+        namespace["__setattr__"] = _frozen_setattr
+        namespace["__delattr__"] = _frozen_delattr
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@_slotted
+@dataclass(frozen=True, **_SLOTS)
 class PartSearchResult:
-    """Data class for part search result"""
+    """Data class for part search result, immutable once parsed"""
     supplier: str
     part_number: str
     manufacturer: str
@@ -32,26 +148,303 @@ class PartSearchResult:
     package: str = ""
 
 
+@dataclass(frozen=True)
+class Query:
+    """One part search, as sent in a batch search"""
+    value: str
+    footprint: Optional[str] = None
+    component_type: Optional[str] = None
+
+
+def _normalize_term(term: Optional[str]) -> str:
+    """Search term as used in cache keys"""
+    # Runs of whitespace don't change a search, case does (1M vs 1m)
+    return " ".join((term or "").split())
+
+
+def _has_search_terms(query: Query) -> bool:
+    """Whether query has anything to search for"""
+    return bool(
+        (query.value or "").strip() or (query.footprint or "").strip()
+        or (query.component_type or "").strip())
+
+
+class _TTLCache(object):
+    """Thread safe LRU cache whose entries expire after ttl seconds"""
+    
+    def __init__(self, maxsize: int = 512, ttl: float = 600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expiry, value), least recently used first
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return cached value for key or None if missing or expired"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expiry, value = item
+            if expiry < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def discard(self, predicate):
+        """Drop every entry whose key matches predicate"""
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class _DiskCache(object):
+    """
+    SQLite backed cache of search responses that survives between runs
+    
+    One file can be shared by clients of several API servers, each only
+    sees the entries stored under its own scope.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        scope: str = "",
+        ttl: float = DISK_CACHE_TTL,
+        max_age: float = DISK_CACHE_MAX_AGE
+    ):
+        self.path = path
+        self.scope = scope
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        cache_dir = os.path.dirname(path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS search_results "
+                "(scope TEXT, key TEXT, value BLOB, ts INTEGER, "
+                "PRIMARY KEY (scope, key))")
+            # Keeps the file from growing without bound
+            self._db.execute(
+                "DELETE FROM search_results WHERE ts < ?",
+                (int(time.time() - max_age),))
+    
+    def get(
+        self,
+        key,
+        stale_ok: bool = False
+    ) -> Optional[Dict[str, List[PartSearchResult]]]:
+        """Return cached results for key or None if missing or stale"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, ts FROM search_results "
+                "WHERE scope = ? AND key = ?",
+                (self.scope, json.dumps(key))).fetchone()
+        if row is None:
+            return None
+        if not stale_ok and row[1] + self.ttl < time.time():
+            return None
+        return {
+            supplier: [PartSearchResult(**part) for part in parts]
+            for supplier, parts in _loads(row[0]).items()
+        }
+    
+    def set(self, key, results: Dict[str, List[PartSearchResult]]):
+        value = _dumps({
+            supplier: [asdict(part) for part in parts]
+            for supplier, parts in results.items()
+        })
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO search_results VALUES (?, ?, ?, ?)",
+                (self.scope, json.dumps(key), value, int(time.time())))
+    
+    def discard(self, predicate):
+        """Drop every entry whose key matches predicate"""
+        with self._lock, self._db:
+            keys = [
+                row[0] for row in self._db.execute(
+                    "SELECT key FROM search_results WHERE scope = ?",
+                    (self.scope,))
+                if predicate(tuple(json.loads(row[0])))
+            ]
+            self._db.executemany(
+                "DELETE FROM search_results WHERE scope = ? AND key = ?",
+                [(self.scope, key) for key in keys])
+    
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM search_results WHERE scope = ?", (self.scope,))
+    
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def _retry_after(response: requests.Response) -> float:
+    """Seconds to wait as requested by a 429 response, capped"""
+    try:
+        delay = float(response.headers.get("Retry-After", 1))
+    except ValueError:
+        # HTTP-date form is not worth parsing for a short back-off
+        delay = 1
+    return min(max(delay, 0), MAX_RETRY_AFTER)
+
+
 class BOMPartsSourcingClient:
     """Client for BOM Parts Sourcing API server"""
     
-    def __init__(self, api_base_url: str = "http://localhost:3000"):
+    def __init__(
+        self,
+        api_base_url: str = "http://localhost:3000",
+        cache_size: int = 512,
+        cache_ttl: float = 600,
+        cache_path: Optional[str] = None,
+        refresh: bool = False,
+        max_concurrent: Optional[Dict[str, int]] = None,
+        timeout: Tuple[float, float] = SEARCH_TIMEOUT,
+        prewarm: bool = True
+    ):
         """
         Initialize client
         
         Args:
             api_base_url: Base URL of the BOM Parts Sourcing API server
+            cache_size: Max number of search responses kept in memory
+            cache_ttl: Seconds a cached search response stays valid
+            cache_path: SQLite file used to keep search responses between
+                runs for DISK_CACHE_TTL seconds, None disables it. Older
+                responses are still used while the server is unreachable,
+                up to DISK_CACHE_MAX_AGE.
+            refresh: Ignore cached responses, fresh ones are still stored
+            max_concurrent: Max requests in flight per supplier,
+                defaults to DEFAULT_MAX_CONCURRENT
+            timeout: (connect, read) timeout of search requests in seconds
+            prewarm: Connect to the API server in the background so the
+                first search doesn't wait for the connection
         """
         self.api_base_url = api_base_url.rstrip('/')
+        self.timeout = timeout
+        # Endpoint URLs are resolved once rather than formatted per request
+        self._config_url = f"{self.api_base_url}/api/config"
+        self._search_url = f"{self.api_base_url}/api/parts-search"
+        self._batch_url = f"{self.api_base_url}/api/parts-search/batch"
+        # Unknown until the batch endpoint is first tried
+        self._supports_batch: Optional[bool] = None
+        
+        limits = dict(DEFAULT_MAX_CONCURRENT)
+        limits.update(max_concurrent or {})
+        self._slots = {
+            supplier: threading.BoundedSemaphore(limit)
+            for supplier, limit in limits.items()
+        }
+        
+        # BOMs repeat the same value/footprint on many rows, so identical
+        # searches are answered from memory instead of the network
+        self._cache = _TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._disk_cache = None
+        if cache_path:
+            try:
+                # Responses of another API server must not be served
+                self._disk_cache = _DiskCache(
+                    cache_path, scope=self.api_base_url)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Search cache {cache_path} unavailable: {e}")
+        self.refresh = refresh
+        # cache key -> Future of the request in flight
+        self._inflight: Dict[Tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Supplier credential status reported by the server rarely changes
+        self._config: Optional[Dict] = None
+        self._config_expiry = 0.0
+        
+        # One pooled session for all calls so keep-alive connections to the
+        # API server are reused instead of reconnecting on every request.
+        # The pool holds a connection for every search that may be in
+        # flight and callers wait for a free one rather than opening
+        # extra connections that would be discarded after a single use.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=max(20, sum(limits.values())),
+            pool_block=True,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            # requests already asks for gzip/deflate, and for br/zstd when
+            # brotli or zstandard is installed to decode them
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "User-Agent": USER_AGENT
+        })
+        
+        if prewarm:
+            threading.Thread(target=self._prewarm, daemon=True).start()
     
-    def check_config(self) -> Dict:
-        """Check API server configuration status"""
+    def _prewarm(self):
+        """Leave an open connection to the API server in the session pool"""
         try:
-            response = requests.get(f"{self.api_base_url}/api/config", timeout=10)
+            self.session.head(self._config_url, timeout=(self.timeout[0], 5))
+        except requests.RequestException as e:
+            logger.debug(f"Connection prewarm failed: {e}")
+    
+    def close(self):
+        """Close pooled connections and the search cache file"""
+        self.session.close()
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def check_config(self, refresh: bool = False) -> Dict:
+        """
+        Check API server configuration status
+        
+        The status is cached for CONFIG_TTL seconds; failed checks are
+        not cached.
+        
+        Args:
+            refresh: Ignore the cached status and ask the server again
+        """
+        if (not refresh and self._config is not None
+                and time.monotonic() < self._config_expiry):
+            return dict(self._config)
+        try:
+            response = self.session.get(
+                self._config_url, timeout=(self.timeout[0], 10))
             if response.status_code == 200:
-                return response.json()
+                self._config = _loads(response.content)
+                self._config_expiry = time.monotonic() + CONFIG_TTL
+                return dict(self._config)
         except Exception as e:
             logger.error(f"Config check failed: {e}")
+        self._config = None
         return {}
     
     def search_parts(
@@ -60,7 +453,10 @@ class BOMPartsSourcingClient:
         footprint: Optional[str] = None,
         component_type: Optional[str] = None,
         suppliers: Optional[List[str]] = None,
-        limit: int = 10
+        limit: int = 10,
+        in_stock: bool = False,
+        no_cache: bool = False,
+        timeout: Optional[Tuple[float, float]] = None
     ) -> Dict[str, List[PartSearchResult]]:
         """
         Search for parts across all suppliers
@@ -71,44 +467,97 @@ class BOMPartsSourcingClient:
             component_type: Optional type (resistor, capacitor, etc.)
             suppliers: List of suppliers to search ["jlcpcb", "digikey", "mouser"]
             limit: Max results per supplier
+            in_stock: Only return parts that are in stock
+            no_cache: Neither use nor store a cached response
+            timeout: (connect, read) timeout in seconds, defaults to the
+                client's
             
         Returns:
             Dictionary with supplier names as keys and lists of PartSearchResult as values
         """
+        if not _has_search_terms(Query(value, footprint, component_type)):
+            logger.debug("Skipping part search, nothing to search for")
+            return {}
+        
         if suppliers is None:
             suppliers = ["jlcpcb", "digikey", "mouser"]
         
-        results = {}
+        cache_key = self._cache_key(
+            value, footprint, component_type, suppliers, limit, in_stock)
+        cached = None
+        if not (self.refresh or no_cache):
+            cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        payload = {
+            "value": value or "",
+            "footprint": footprint or "",
+            "componentType": component_type or "",
+            "suppliers": suppliers,
+            "limit": limit
+        }
+        if in_stock:
+            # Lets the server filter before the results are sent
+            payload["inStock"] = True
+        
+        # Identical searches issued while one is already in flight wait for
+        # its response instead of sending the same request again
+        with self._inflight_lock:
+            pending = self._inflight.get(cache_key)
+            if pending is None:
+                future: Future = Future()
+                self._inflight[cache_key] = future
+        
+        if pending is not None:
+            return {
+                supplier: list(parts)
+                for supplier, parts in pending.result().items()
+            }
         
         try:
-            response = requests.post(
-                f"{self.api_base_url}/api/parts-search",
-                headers={"Content-Type": "application/json"},
-                json={
-                    "value": value,
-                    "footprint": footprint or "",
-                    "componentType": component_type or "",
-                    "suppliers": suppliers,
-                    "limit": limit
-                },
-                timeout=60  # Allow more time for multiple API calls
-            )
+            results = self._fetch_parts(
+                cache_key, payload, store=not no_cache, timeout=timeout)
+            future.set_result(results)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[cache_key]
+        
+        return {supplier: list(parts) for supplier, parts in results.items()}
+    
+    def _fetch_parts(
+        self,
+        cache_key,
+        payload: Dict,
+        store: bool = True,
+        timeout: Optional[Tuple[float, float]] = None
+    ) -> Dict[str, List[PartSearchResult]]:
+        """Run a search against the API server and cache a successful response"""
+        results: Dict[str, List[PartSearchResult]] = {}
+        
+        try:
+            with self._supplier_slots(payload["suppliers"]):
+                response = self._post_search(
+                    self._search_url, payload, timeout=timeout)
             
             if response.status_code != 200:
                 logger.error(f"Search failed: {response.status_code} - {response.text}")
                 return results
             
-            data = response.json()
+            logger.debug(
+                f"Search response: {len(response.content)} bytes, "
+                f"Content-Encoding: {response.headers.get('Content-Encoding', 'identity')}")
+            data = _loads(response.content)
             
             if not data.get("success"):
                 logger.error(f"Search unsuccessful: {data}")
                 return results
             
-            # Parse results by supplier
-            for supplier, parts in data.get("results", {}).items():
-                results[supplier] = [
-                    self._parse_result(part) for part in parts
-                ]
+            results = self._parse_results(
+                data.get("results", {}), payload.get("inStock", False))
             
             # Log configuration status
             configured = data.get("configured", {})
@@ -116,11 +565,214 @@ class BOMPartsSourcingClient:
                 if not is_configured:
                     logger.warning(f"{supplier} API not configured on server")
             
+            if store:
+                self._cache_results(
+                    Query(payload["value"], payload["footprint"],
+                          payload["componentType"]),
+                    payload["suppliers"], payload["limit"], results,
+                    payload.get("inStock", False))
+            
+        except requests.RequestException as e:
+            logger.error(f"Search error: {e}")
+            # Offline, an outdated response beats none at all
+            stale = self._get_stale(cache_key) if store else None
+            if stale is not None:
+                logger.warning("Using outdated cached search results")
+                results = stale
         except Exception as e:
             logger.error(f"Search error: {e}")
         
         return results
     
+    def search_parts_batch(
+        self,
+        queries: List[Query],
+        suppliers: Optional[List[str]] = None,
+        limit: int = 10,
+        max_workers: int = BATCH_FALLBACK_WORKERS
+    ) -> List[Dict[str, List[PartSearchResult]]]:
+        """
+        Search for many parts with a single request
+        
+        Cached and duplicate queries are not sent again. Servers without
+        the batch endpoint are detected once, after that the queries are
+        sent as concurrent search_parts() calls instead.
+        
+        Args:
+            queries: Parts to search for
+            suppliers: List of suppliers to search ["jlcpcb", "digikey", "mouser"]
+            limit: Max results per supplier and query
+            max_workers: Max concurrent searches when falling back to
+                search_parts()
+            
+        Returns:
+            One search_parts() style dictionary per query, in query order
+        """
+        if suppliers is None:
+            suppliers = ["jlcpcb", "digikey", "mouser"]
+        
+        results: List[Optional[Dict[str, List[PartSearchResult]]]] = [
+            None] * len(queries)
+        if not self.refresh:
+            results = [
+                self._get_cached(self._cache_key(
+                    q.value, q.footprint, q.component_type, suppliers, limit))
+                for q in queries
+            ]
+        # Blank queries are answered like search_parts() does, without
+        # sending them to the server
+        results = [
+            {} if result is None and not _has_search_terms(q) else result
+            for q, result in zip(queries, results)
+        ]
+        pending = list(dict.fromkeys(
+            q for q, found in zip(queries, results) if found is None))
+        
+        found: Dict[Query, Dict[str, List[PartSearchResult]]] = {}
+        if pending:
+            batch = None
+            if self._supports_batch is not False:
+                batch = self._fetch_batch(pending, suppliers, limit)
+            if batch is not None:
+                found = batch
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    found = dict(zip(pending, executor.map(
+                        lambda q: self.search_parts(
+                            q.value, q.footprint, q.component_type,
+                            suppliers, limit),
+                        pending)))
+        
+        return [
+            result if result is not None else {
+                supplier: list(parts)
+                for supplier, parts in found[q].items()
+            }
+            for q, result in zip(queries, results)
+        ]
+    
+    def _fetch_batch(
+        self,
+        queries: List[Query],
+        suppliers: List[str],
+        limit: int
+    ) -> Optional[Dict[Query, Dict[str, List[PartSearchResult]]]]:
+        """
+        Run queries through the batch endpoint and cache the responses
+        
+        Returns None if the server has no batch endpoint.
+        """
+        found: Dict[Query, Dict[str, List[PartSearchResult]]] = {
+            q: {} for q in queries}
+        payload = {
+            "queries": [
+                {
+                    "value": q.value or "",
+                    "footprint": q.footprint or "",
+                    "componentType": q.component_type or ""
+                }
+                for q in queries
+            ],
+            "suppliers": suppliers,
+            "limit": limit
+        }
+        try:
+            with self._supplier_slots(suppliers):
+                response = self._post_search(
+                    self._batch_url, payload,
+                    timeout=(
+                        self.timeout[0],
+                        max(self.timeout[1], min(300, 10 + 2 * len(queries)))))
+            
+            if response.status_code == 404:
+                logger.info("API server has no batch search, using single searches")
+                self._supports_batch = False
+                return None
+            self._supports_batch = True
+            
+            if response.status_code != 200:
+                logger.error(f"Batch search failed: {response.status_code} - {response.text}")
+                return found
+            
+            data = _loads(response.content)
+            if not data.get("success"):
+                logger.error(f"Batch search unsuccessful: {data}")
+                return found
+            
+            for q, supplier_parts in zip(queries, data.get("results", [])):
+                found[q] = self._parse_results(supplier_parts, False)
+                self._cache_results(q, suppliers, limit, found[q])
+            
+        except requests.RequestException as e:
+            logger.error(f"Batch search error: {e}")
+            # Offline, outdated responses beat none at all
+            stale = 0
+            for q in queries:
+                cached = self._get_stale(self._cache_key(
+                    q.value, q.footprint, q.component_type, suppliers, limit))
+                if cached is not None:
+                    found[q] = cached
+                    stale += 1
+            if stale:
+                logger.warning(f"Using outdated cached results for {stale} searches")
+        except Exception as e:
+            logger.error(f"Batch search error: {e}")
+        
+        return found
+    
+    def _supplier_slots(self, suppliers: List[str]) -> ExitStack:
+        """Hold a concurrency slot of every supplier in suppliers"""
+        stack = ExitStack()
+        # Fixed acquisition order so concurrent callers can't deadlock
+        for supplier in sorted(suppliers):
+            if supplier in self._slots:
+                stack.enter_context(self._slots[supplier])
+        return stack
+    
+    def _post_search(
+        self,
+        url: str,
+        payload: Dict,
+        timeout: Optional[Tuple[float, float]] = None
+    ) -> requests.Response:
+        """POST a search request, waiting out one rate limit response"""
+        timeout = timeout or self.timeout
+        response = self.session.post(url, json=payload, timeout=timeout)
+        if response.status_code == 429:
+            delay = _retry_after(response)
+            logger.warning(f"Rate limited by API server, retrying in {delay}s")
+            time.sleep(delay)
+            response = self.session.post(url, json=payload, timeout=timeout)
+        return response
+    
+    @staticmethod
+    def _cache_key(value, footprint, component_type, suppliers, limit,
+                   in_stock=False) -> Tuple:
+        return (
+            _normalize_term(value),
+            _normalize_term(footprint),
+            _normalize_term(component_type),
+            tuple(sorted(suppliers)),
+            limit,
+            in_stock
+        )
+    
+    def _parse_results(
+        self,
+        supplier_parts: Dict[str, List[Dict]],
+        in_stock: bool
+    ) -> Dict[str, List[PartSearchResult]]:
+        """Parse the per supplier part lists of one search response"""
+        results = {}
+        for supplier, parts in supplier_parts.items():
+            results[supplier] = [self._parse_result(part) for part in parts]
+            if in_stock:
+                # Servers that ignore inStock still return sold out parts
+                results[supplier] = [
+                    part for part in results[supplier] if part.stock > 0
+                ]
+        return results
+    
     def _parse_result(self, data: Dict) -> PartSearchResult:
         """Parse API response into PartSearchResult"""
         return PartSearchResult(
@@ -131,8 +783,8 @@ class BOMPartsSourcingClient:
             description=data.get("description", ""),
             value=data.get("value", ""),
             footprint=data.get("footprint", ""),
-            stock=data.get("stock", 0),
-            price=data.get("price", 0.0),
+            stock=_safe_int(data.get("stock")),
+            price=_safe_float(data.get("price")),
             currency=data.get("currency", "USD"),
             url=data.get("url", ""),
             datasheet=data.get("datasheet", ""),
@@ -140,27 +792,118 @@ class BOMPartsSourcingClient:
             image=data.get("image", ""),
             package=data.get("package", "")
         )
+    
+    def _get_cached(self, key) -> Optional[Dict[str, List[PartSearchResult]]]:
+        """Look a search up in memory, then on disk"""
+        results = self._cache.get(key)
+        if results is None and self._disk_cache is not None:
+            try:
+                results = self._disk_cache.get(key)
+            except (sqlite3.Error, ValueError, TypeError) as e:
+                logger.warning(f"Search cache read failed: {e}")
+            if results is not None:
+                self._cache.set(key, results)
+        if results is None:
+            return None
+        return {supplier: list(parts) for supplier, parts in results.items()}
+    
+    def _get_stale(self, key) -> Optional[Dict[str, List[PartSearchResult]]]:
+        """Look a search up on disk regardless of its age"""
+        if self._disk_cache is None:
+            return None
+        try:
+            return self._disk_cache.get(key, stale_ok=True)
+        except (sqlite3.Error, ValueError, TypeError) as e:
+            logger.warning(f"Search cache read failed: {e}")
+        return None
+    
+    def _cache_results(
+        self,
+        query: Query,
+        suppliers: List[str],
+        limit: int,
+        results: Dict[str, List[PartSearchResult]],
+        in_stock: bool = False
+    ):
+        """Cache a response, and each supplier's share of it on its own"""
+        self._set_cached(self._cache_key(
+            query.value, query.footprint, query.component_type, suppliers,
+            limit, in_stock), results)
+        if len(suppliers) < 2:
+            return
+        # Drilling down into one supplier later needs no request of its own
+        for supplier in suppliers:
+            name = SUPPLIER_NAMES.get(supplier)
+            if name in results:
+                self._set_cached(self._cache_key(
+                    query.value, query.footprint, query.component_type,
+                    [supplier], limit, in_stock), {name: results[name]})
+    
+    def _set_cached(self, key, results: Dict[str, List[PartSearchResult]]):
+        results = {supplier: list(parts) for supplier, parts in results.items()}
+        self._cache.set(key, results)
+        if self._disk_cache is not None:
+            try:
+                self._disk_cache.set(key, results)
+            except sqlite3.Error as e:
+                logger.warning(f"Search cache write failed: {e}")
+    
+    def invalidate(self, value: str, footprint: Optional[str] = None):
+        """
+        Drop cached responses for one query, in memory and on disk
+        
+        Args:
+            value: Searched component value
+            footprint: Only drop responses for this footprint, None drops
+                responses for any footprint
+        """
+        value = _normalize_term(value)
+        if footprint is not None:
+            footprint = _normalize_term(footprint)
+        
+        def matches(key):
+            return key[0] == value and footprint in (None, key[1])
+        
+        self._cache.discard(matches)
+        if self._disk_cache is not None:
+            try:
+                self._disk_cache.discard(matches)
+            except sqlite3.Error as e:
+                logger.warning(f"Search cache invalidation failed: {e}")
+    
+    def clear_cache(self):
+        """Drop all cached search responses, in memory and on disk"""
+        self._cache.clear()
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
 
 
 # Legacy class names for backward compatibility
 class JLCPCBClient:
     """Legacy client - now uses BOMPartsSourcingClient internally"""
     
-    def __init__(self, api_base_url: str = "http://localhost:3000"):
-        self.client = BOMPartsSourcingClient(api_base_url)
+    def __init__(
+        self,
+        api_base_url: str = "http://localhost:3000",
+        client: Optional[BOMPartsSourcingClient] = None
+    ):
+        # A shared client shares its connection pool and search cache
+        self.client = client or BOMPartsSourcingClient(api_base_url)
     
     def search_components(
         self,
         search_term: str,
         package: Optional[str] = None,
-        limit: int = 10
+        limit: int = 10,
+        in_stock: bool = False
     ) -> List[Dict]:
         """Search for components on JLCPCB"""
         results = self.client.search_parts(
             value=search_term,
             footprint=package,
             suppliers=["jlcpcb"],
-            limit=limit
+            limit=limit,
+            in_stock=in_stock
         )
         
         # Convert to legacy format
@@ -184,20 +927,25 @@ class JLCPCBClient:
         if not components:
             return None
         
-        # Sort by stock (descending), then by price (ascending)
-        def sort_key(comp):
-            stock = int(comp.get("stock", 0))
-            price = float(comp.get("price", 0))
-            return (-stock, price)
+        if len(components) == 1:
+            return components[0]
         
-        sorted_components = sorted(components, key=sort_key)
-        return sorted_components[0]
+        # A single linear pass instead of sorting a list we only need the
+        # head of
+        return min(components, key=_jlcpcb_sort_key)
 
 
 class PartSearcher:
     """Main class for part search - uses BOM Parts Sourcing API"""
     
-    def __init__(self, config: Optional[Dict] = None):
+    def __init__(
+        self,
+        config: Optional[Dict] = None,
+        max_concurrent_jlcpcb: int = 8,
+        max_concurrent_digikey: int = 4,
+        max_concurrent_mouser: int = 4,
+        prewarm: bool = True
+    ):
         """
         Initialize part searcher
         
@@ -205,37 +953,79 @@ class PartSearcher:
             config: Dictionary with configuration:
                 {
                     'api_base_url': str,  # URL of BOM Parts Sourcing API
+                    'cache_path': str,  # Search cache file, default
+                                        # DEFAULT_CACHE_PATH
+                    'no_cache': bool,  # Don't keep results between runs
+                    'refresh_parts': bool,  # Ignore cached results
                     'digikey_client_id': str,  # Legacy - ignored
                     'digikey_client_secret': str,  # Legacy - ignored
                     'mouser_api_key': str  # Legacy - ignored
                 }
+            max_concurrent_jlcpcb: Max JLCPCB searches in flight
+            max_concurrent_digikey: Max Digi-Key searches in flight
+            max_concurrent_mouser: Max Mouser searches in flight
+            prewarm: Connect to the API server in the background so the
+                first search doesn't wait for the connection
         """
         self.config = config or {}
         api_url = self.config.get("api_base_url", "http://localhost:3000")
-        self.client = BOMPartsSourcingClient(api_url)
-        self.jlcpcb_client = JLCPCBClient(api_url)
+        cache_path = None
+        if not self.config.get("no_cache"):
+            cache_path = self.config.get("cache_path", DEFAULT_CACHE_PATH)
+        self.client = BOMPartsSourcingClient(
+            api_url,
+            cache_path=cache_path,
+            refresh=bool(self.config.get("refresh_parts")),
+            max_concurrent={
+                "jlcpcb": max_concurrent_jlcpcb,
+                "digikey": max_concurrent_digikey,
+                "mouser": max_concurrent_mouser
+            },
+            prewarm=prewarm
+        )
+        self.jlcpcb_client = JLCPCBClient(api_url, client=self.client)
         
         # Legacy attributes
         self.digikey_api_base = "https://api.digikey.com"
         self.mouser_api_base = "https://api.mouser.com/api/v1"
     
+    def close(self):
+        """Close pooled connections and the search cache file"""
+        self.client.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def clear_cache(self):
+        """Drop cached search results so the next searches hit the API"""
+        self.client.clear_cache()
+    
     def search_jlcpcb(
         self,
         value: str,
         footprint: Optional[str] = None,
         manufacturer: Optional[str] = None,
-        mfg_part: Optional[str] = None
+        mfg_part: Optional[str] = None,
+        in_stock: bool = False,
+        max_results: int = 10,
+        component_type: Optional[str] = None
     ) -> List[PartSearchResult]:
-        """Search for parts on JLCPCB"""
-        search_term = mfg_part if mfg_part else value
-        if manufacturer and mfg_part:
-            search_term = f"{manufacturer} {mfg_part}"
+        """Search for parts on JLCPCB, optionally only those in stock"""
+        search_term = self._search_term(value, manufacturer, mfg_part)
+        footprint = (footprint or "").strip()
+        if not (search_term or footprint):
+            return []
         
         results = self.client.search_parts(
             value=search_term,
             footprint=footprint,
+            component_type=component_type,
             suppliers=["jlcpcb"],
-            limit=10
+            limit=max_results,
+            in_stock=in_stock
         )
         
         return results.get("JLCPCB", [])
@@ -244,15 +1034,21 @@ class PartSearcher:
         self,
         value: str,
         footprint: Optional[str] = None,
-        component_type: Optional[str] = None
+        component_type: Optional[str] = None,
+        max_results: int = 10
     ) -> List[PartSearchResult]:
         """Search for parts on Digi-Key"""
+        value = (value or "").strip()
+        footprint = (footprint or "").strip()
+        if not (value or footprint):
+            return []
+        
         results = self.client.search_parts(
             value=value,
             footprint=footprint,
             component_type=component_type,
             suppliers=["digikey"],
-            limit=10
+            limit=max_results
         )
         
         return results.get("Digi-Key", [])
@@ -261,15 +1057,21 @@ class PartSearcher:
         self,
         value: str,
         footprint: Optional[str] = None,
-        component_type: Optional[str] = None
+        component_type: Optional[str] = None,
+        max_results: int = 10
     ) -> List[PartSearchResult]:
         """Search for parts on Mouser"""
+        value = (value or "").strip()
+        footprint = (footprint or "").strip()
+        if not (value or footprint):
+            return []
+        
         results = self.client.search_parts(
             value=value,
             footprint=footprint,
             component_type=component_type,
             suppliers=["mouser"],
-            limit=10
+            limit=max_results
         )
         
         return results.get("Mouser", [])
@@ -280,34 +1082,129 @@ class PartSearcher:
         footprint: Optional[str] = None,
         component_type: Optional[str] = None,
         manufacturer: Optional[str] = None,
-        mfg_part: Optional[str] = None
+        mfg_part: Optional[str] = None,
+        max_results: int = 10
     ) -> Dict[str, List[PartSearchResult]]:
-        """Search for parts across all configured suppliers"""
+        """
+        Search for parts across all configured suppliers
         
-        # Build search term
-        search_term = value
-        if mfg_part:
-            search_term = mfg_part
-            if manufacturer:
-                search_term = f"{manufacturer} {mfg_part}"
+        A single request names all suppliers, the API server queries them.
+        Each supplier's results are also cached on their own, so drilling
+        down with search_jlcpcb() and friends afterwards is served from the
+        cache.
+        """
+        search = self._all_suppliers_search(
+            value, footprint, component_type, manufacturer, mfg_part,
+            max_results)
+        if search is None:
+            return {}
+        return search()
+    
+    async def search_all_async(
+        self,
+        value: str,
+        footprint: Optional[str] = None,
+        component_type: Optional[str] = None,
+        manufacturer: Optional[str] = None,
+        mfg_part: Optional[str] = None,
+        max_results: int = 10
+    ) -> Dict[str, List[PartSearchResult]]:
+        """
+        Awaitable variant of search_all() for callers running an event loop
         
-        return self.client.search_parts(
+        The request runs in the loop's default executor, so the loop is not
+        blocked while it is in flight.
+        """
+        search = self._all_suppliers_search(
+            value, footprint, component_type, manufacturer, mfg_part,
+            max_results)
+        if search is None:
+            return {}
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, search)
+    
+    def _all_suppliers_search(
+        self,
+        value: str,
+        footprint: Optional[str],
+        component_type: Optional[str],
+        manufacturer: Optional[str],
+        mfg_part: Optional[str],
+        max_results: int
+    ) -> Optional[functools.partial]:
+        """The search_parts() call made by search_all(), None if blank"""
+        search_term = self._search_term(value, manufacturer, mfg_part)
+        if not (search_term or (footprint or "").strip()):
+            logger.debug("Skipping part search, nothing to search for")
+            return None
+        
+        return functools.partial(
+            self.client.search_parts,
             value=search_term,
             footprint=footprint,
             component_type=component_type,
             suppliers=["jlcpcb", "digikey", "mouser"],
-            limit=10
+            limit=max_results
+        )
+    
+    @staticmethod
+    def _search_term(
+        value: Optional[str],
+        manufacturer: Optional[str],
+        mfg_part: Optional[str]
+    ) -> str:
+        """Term searched for a BOM line, its MPN when it has a real one"""
+        mfg_part = (mfg_part or "").strip()
+        # Placeholders like "-" or "NA" are not worth an MPN search
+        if len(mfg_part) <= 2:
+            return (value or "").strip()
+        if manufacturer:
+            return f"{manufacturer} {mfg_part}"
+        return mfg_part
+    
+    def search_many(
+        self,
+        queries: List[Tuple[str, Optional[str], Optional[str]]],
+        max_workers: int = BATCH_FALLBACK_WORKERS,
+        max_results: int = 10
+    ) -> Dict[str, List[List[PartSearchResult]]]:
+        """
+        Search for parts for many BOM lines at once
+        
+        Identical queries are searched only once and all of them go to the
+        API server in a single batch request. Servers without batch
+        support get concurrent single searches instead.
+        
+        Args:
+            queries: List of (value, footprint, component_type) tuples
+            max_workers: Max number of searches in flight when the server
+                has no batch support
+            max_results: Max results per supplier and query
+            
+        Returns:
+            Dictionary with supplier names as keys and, for each supplier,
+            a list of results aligned with queries
+        """
+        found = self.client.search_parts_batch(
+            [Query(*query) for query in queries],
+            limit=max_results,
+            max_workers=max_workers
         )
+        
+        suppliers = []
+        for supplier_results in found:
+            for supplier in supplier_results:
+                if supplier not in suppliers:
+                    suppliers.append(supplier)
+        
+        return {
+            supplier: [supplier_results.get(supplier, []) for supplier_results in found]
+            for supplier in suppliers
+        }
 
 
-def get_part_search_html(api_base_url: str = "http://localhost:3000") -> str:
-    """
-    Return HTML/JavaScript for part search UI
-    
-    Args:
-        api_base_url: Base URL of the BOM Parts Sourcing API server
-    """
-    return f'''
+# Static part search UI, __BOM_API_URL__ is replaced with the API server URL
+_PART_SEARCH_HTML_TEMPLATE = '''
 <div id="part-search-panel" style="display:none; position:fixed; top:20%; left:50%; transform:translate(-50%,0); z-index:9999; background:white; padding:20px; border-radius:8px; box-shadow:0 4px 20px rgba(0,0,0,0.3); max-width:800px; max-height:80vh; overflow-y:auto;">
     <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:15px; border-bottom:1px solid #eee; padding-bottom:10px;">
         <h3 style="margin:0; color:#333;">Component Search</h3>
@@ -368,53 +1265,53 @@ def get_part_search_html(api_base_url: str = "http://localhost:3000") -> str:
 <div id="part-search-overlay" style="display:none; position:fixed; top:0; left:0; right:0; bottom:0; background:rgba(0,0,0,0.5); z-index:9998;" onclick="closePartSearch()"></div>
 
 <script>
-const BOM_API_URL = "{api_base_url}";
-let partSearchCache = {{}};
-let configStatus = {{}};
+const BOM_API_URL = "__BOM_API_URL__";
+let partSearchCache = {};
+let configStatus = {};
 
 // Check API configuration on load
 fetch(BOM_API_URL + '/api/config')
     .then(r => r.json())
-    .then(data => {{
-        configStatus = data.suppliers || {{}};
+    .then(data => {
+        configStatus = data.suppliers || {};
         updateConfigStatus();
-    }})
+    })
     .catch(e => console.error('Config check failed:', e));
 
-function updateConfigStatus() {{
+function updateConfigStatus() {
     const container = document.getElementById('search-config-status');
     let html = '<strong>API Status:</strong> ';
     
     const suppliers = [
-        {{key: 'jlcpcb', name: 'JLCPCB'}},
-        {{key: 'digikey', name: 'Digi-Key'}},
-        {{key: 'mouser', name: 'Mouser'}}
+        {key: 'jlcpcb', name: 'JLCPCB'},
+        {key: 'digikey', name: 'Digi-Key'},
+        {key: 'mouser', name: 'Mouser'}
     ];
     
-    for (const s of suppliers) {{
+    for (const s of suppliers) {
         const isConfigured = configStatus[s.key]?.configured;
         const color = isConfigured ? '#28a745' : '#dc3545';
         const symbol = isConfigured ? '✓' : '✗';
-        html += `<span style="margin-right:10px; color:${{color}}">${{symbol}} ${{s.name}}</span>`;
-    }}
+        html += `<span style="margin-right:10px; color:${color}">${symbol} ${s.name}</span>`;
+    }
     
     container.innerHTML = html;
-}}
+}
 
-function openPartSearch(value, footprint) {{
+function openPartSearch(value, footprint) {
     document.getElementById('part-search-panel').style.display = 'block';
     document.getElementById('part-search-overlay').style.display = 'block';
 
     if (value) document.getElementById('search-value').value = value;
     if (footprint) document.getElementById('search-footprint').value = footprint;
-}}
+}
 
-function closePartSearch() {{
+function closePartSearch() {
     document.getElementById('part-search-panel').style.display = 'none';
     document.getElementById('part-search-overlay').style.display = 'none';
-}}
+}
 
-function searchParts() {{
+function searchParts() {
     const value = document.getElementById('search-value').value.trim();
     const footprint = document.getElementById('search-footprint').value.trim();
     const type = document.getElementById('search-type').value;
@@ -422,17 +1319,17 @@ function searchParts() {{
     const useDigiKey = document.getElementById('check-digikey').checked;
     const useMouser = document.getElementById('check-mouser').checked;
 
-    if (!value && !footprint) {{
+    if (!value && !footprint) {
         alert('Please enter a value or footprint to search');
         return;
-    }}
+    }
 
-    const cacheKey = `${{value}}-${{footprint}}-${{type}}-${{useJLCPCB}}-${{useDigiKey}}-${{useMouser}}`;
+    const cacheKey = `${value}-${footprint}-${type}-${useJLCPCB}-${useDigiKey}-${useMouser}`;
 
-    if (partSearchCache[cacheKey]) {{
+    if (partSearchCache[cacheKey]) {
         displaySearchResults(partSearchCache[cacheKey]);
         return;
-    }}
+    }
 
     document.getElementById('search-input-section').style.display = 'none';
     document.getElementById('search-loading').style.display = 'block';
@@ -443,28 +1340,28 @@ function searchParts() {{
     if (useMouser) suppliers.push('mouser');
 
     // Call BOM Parts Sourcing API
-    fetch(BOM_API_URL + '/api/parts-search', {{
+    fetch(BOM_API_URL + '/api/parts-search', {
         method: 'POST',
-        headers: {{ 'Content-Type': 'application/json' }},
-        body: JSON.stringify({{
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
             value: value,
             footprint: footprint,
             componentType: type,
             suppliers: suppliers,
             limit: 10
-        }})
-    }})
+        })
+    })
     .then(response => response.json())
-    .then(data => {{
+    .then(data => {
         document.getElementById('search-loading').style.display = 'none';
         document.getElementById('search-input-section').style.display = 'block';
         
-        if (data.success) {{
-            const results = {{}};
+        if (data.success) {
+            const results = {};
             
             // Map API response to display format
-            for (const [supplier, parts] of Object.entries(data.results || {{}})) {{
-                results[supplier] = parts.map(p => ({{
+            for (const [supplier, parts] of Object.entries(data.results || {})) {
+                results[supplier] = parts.map(p => ({
                     supplier: p.supplier,
                     part_number: p.partNumber,
                     manufacturer: p.manufacturer,
@@ -480,62 +1377,62 @@ function searchParts() {{
                     lcsc_part: p.lcscPart,
                     image: p.image,
                     package: p.package
-                }}));
-            }}
+                }));
+            }
             
             partSearchCache[cacheKey] = results;
             displaySearchResults(results);
             
             // Update config status
-            if (data.configured) {{
-                const newConfig = {{}};
-                for (const [k, v] of Object.entries(data.configured)) {{
-                    newConfig[k] = {{ configured: v }};
-                }}
+            if (data.configured) {
+                const newConfig = {};
+                for (const [k, v] of Object.entries(data.configured)) {
+                    newConfig[k] = { configured: v };
+                }
                 configStatus = newConfig;
                 updateConfigStatus();
-            }}
-        }} else {{
+            }
+        } else {
             document.getElementById('search-results').innerHTML = 
                 '<div style="text-align:center; padding:30px; color:#dc3545;">Search failed: ' + 
                 (data.error || 'Unknown error') + '</div>';
-        }}
-    }})
-    .catch(error => {{
+        }
+    })
+    .catch(error => {
         document.getElementById('search-loading').style.display = 'none';
         document.getElementById('search-input-section').style.display = 'block';
         document.getElementById('search-results').innerHTML = 
             '<div style="text-align:center; padding:30px; color:#dc3545;">Search error: ' + 
             error.message + '<br><br>Make sure the BOM Parts Sourcing API is running at ' + BOM_API_URL + '</div>';
-    }});
-}}
+    });
+}
 
-function displaySearchResults(results) {{
+function displaySearchResults(results) {
     const container = document.getElementById('search-results');
     let html = '';
 
-    for (const [supplier, parts] of Object.entries(results)) {{
+    for (const [supplier, parts] of Object.entries(results)) {
         if (!parts || parts.length === 0) continue;
 
-        const supplierColors = {{
+        const supplierColors = {
             'JLCPCB': '#1a73e8',
             'Digi-Key': '#e74c3c',
             'Mouser': '#17a2b8'
-        }};
+        };
         const color = supplierColors[supplier] || '#666';
 
         html += '<div style="margin-bottom:20px;">';
         html += '<h4 style="margin:0 0 10px 0; color:' + color + '; border-bottom:2px solid ' + color + '; padding-bottom:5px;">' + supplier + ' <span style="font-size:12px; color:#666;">(' + parts.length + ' results)</span></h4>';
 
-        for (const part of parts) {{
+        for (const part of parts) {
             const stockColor = part.stock > 0 ? '#28a745' : '#dc3545';
             const stockText = part.stock > 0 ? part.stock.toLocaleString() + ' in stock' : 'Out of stock';
 
             html += '<div style="border:1px solid #eee; border-radius:6px; padding:12px; margin-bottom:10px; background:#fafafa;">';
 
-            if (part.lcsc_part && supplier === 'JLCPCB') {{
+            if (part.lcsc_part && supplier === 'JLCPCB') {
                 html += '<div style="background:#e8f5e9; color:#333; padding:4px 8px; border-radius:4px; font-size:12px; margin-bottom:8px; display:inline-block;">LCSC: ' + part.lcsc_part + '</div>';
-            }}
+            }
 
             html += '<div style="display:grid; grid-template-columns: 2fr 1fr 1fr; gap:10px; margin-bottom:8px;">';
             html += '<div><strong>Part:</strong> ' + (part.manufacturer_part_number || part.part_number || 'N/A') + '</div>';
@@ -552,36 +1449,67 @@ function displaySearchResults(results) {{
 
             html += '<div style="margin-top:10px; text-align:right;">';
             html += '<a href="' + part.url + '" target="_blank" style="display:inline-block; background:' + color + '; color:white; padding:8px 20px; text-decoration:none; border-radius:4px;">View Part →</a>';
-            if (part.datasheet) {{
+            if (part.datasheet) {
                 html += ' <a href="' + part.datasheet + '" target="_blank" style="display:inline-block; background:#6c757d; color:white; padding:8px 20px; text-decoration:none; border-radius:4px; margin-left:10px;">Datasheet</a>';
-            }}
+            }
             html += '</div>';
 
             html += '</div>';
-        }}
+        }
 
         html += '</div>';
-    }}
+    }
 
-    if (html === '') {{
+    if (html === '') {
         html = '<div style="text-align:center; padding:30px; color:#666;">No results found. Try adjusting your search terms.</div>';
-    }}
+    }
 
     container.innerHTML = html;
-}}
+}
 </script>
 <style>
-#part-search-panel {{
+#part-search-panel {
     font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
-}}
+}
 </style>
 '''
 
 
-def get_part_search_button_html() -> str:
-    """Return HTML for the part search button that can be added to BOM"""
-    return '''
+def _minify_html(html: str) -> str:
+    """
+    Drop indentation, blank lines and whole line // comments
+
+    Line breaks are kept, so JavaScript semicolon insertion and the
+    whitespace between inline elements behave as in the source.
+    """
+    lines = (line.strip() for line in html.splitlines())
+    return "\n".join(
+        line for line in lines if line and not line.startswith("//"))
+
+
+# Minified once at import, this is what ends up in every generated BOM
+_PART_SEARCH_HTML_MIN = _minify_html(_PART_SEARCH_HTML_TEMPLATE)
+
+_PART_SEARCH_BUTTON_HTML = '''
 <button onclick="openPartSearch()" style="background:#17a2b8; color:white; border:none; padding:8px 15px; border-radius:4px; cursor:pointer; margin-left:10px;">
     🔍 Search Parts
 </button>
 '''
+
+
+@functools.lru_cache(maxsize=8)
+def get_part_search_html(api_base_url: str = "http://localhost:3000") -> str:
+    """
+    Return HTML/JavaScript for part search UI
+    
+    The markup is minified at import and rendered once per API URL.
+    
+    Args:
+        api_base_url: Base URL of the BOM Parts Sourcing API server
+    """
+    return _PART_SEARCH_HTML_MIN.replace("__BOM_API_URL__", api_base_url)
+
+
+def get_part_search_button_html() -> str:
+    """Return HTML for the part search button that can be added to BOM"""
+    return _PART_SEARCH_BUTTON_HTML
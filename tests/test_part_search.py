@@ -0,0 +1,277 @@
+import copy
+import dataclasses
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from InteractiveHtmlBom.core import part_search
+
+# Nothing listens here, requests fail to connect right away
+UNREACHABLE_URL = "http://127.0.0.1:1"
+
+
+@part_search._slotted
+@dataclasses.dataclass(frozen=True)
+class _Slotted:
+    name: str
+    count: int = 0
+
+
+def _part(supplier, value):
+    return {
+        "supplier": supplier,
+        "partNumber": f"{supplier}-{value}",
+        "manufacturer": "Yageo",
+        "manufacturerPartNumber": f"RC0402-{value}",
+        "description": "Resistor",
+        "value": value,
+        "footprint": "0402",
+        "stock": 100,
+        "price": 0.01,
+        "currency": "USD",
+        "url": "",
+        "datasheet": "",
+    }
+
+
+def _search_results(query, suppliers):
+    names = part_search.SUPPLIER_NAMES
+    return {
+        names[supplier]: [_part(names[supplier], query["value"])]
+        for supplier in suppliers
+    }
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        self.server.requests.append((self.path, payload))
+        time.sleep(self.server.delay)
+        if self.path == "/api/parts-search":
+            self._send(200, {
+                "success": True,
+                "results": _search_results(payload, payload["suppliers"]),
+            })
+        elif self.path == "/api/parts-search/batch" and self.server.batch:
+            self._send(200, {
+                "success": True,
+                "results": [
+                    _search_results(query, payload["suppliers"])
+                    for query in payload["queries"]
+                ],
+            })
+        else:
+            self._send(404, {"success": False})
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    httpd.daemon_threads = True
+    httpd.requests = []
+    httpd.delay = 0
+    httpd.batch = True
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _client(url, **kwargs):
+    kwargs.setdefault("timeout", (1, 5))
+    return part_search.BOMPartsSourcingClient(url, prewarm=False, **kwargs)
+
+
+def test_disk_cache_survives_clients(server, tmp_path):
+    cache_path = str(tmp_path / "parts.sqlite")
+    with _client(server.url, cache_path=cache_path) as client:
+        client.search_parts("1K", suppliers=["mouser"])
+    with _client(server.url, cache_path=cache_path) as client:
+        results = client.search_parts("1K", suppliers=["mouser"])
+    assert results["Mouser"][0].value == "1K"
+    assert len(server.requests) == 1
+
+
+def test_disk_cache_is_scoped_to_server(server, tmp_path):
+    cache_path = str(tmp_path / "parts.sqlite")
+    with _client(server.url, cache_path=cache_path) as client:
+        client.search_parts("1K", suppliers=["mouser"])
+    with _client(UNREACHABLE_URL, cache_path=cache_path) as client:
+        assert client.search_parts("1K", suppliers=["mouser"]) == {}
+
+
+def test_disk_cache_prunes_old_entries(server, tmp_path):
+    cache_path = str(tmp_path / "parts.sqlite")
+    with _client(server.url, cache_path=cache_path) as client:
+        client.search_parts("1K", suppliers=["mouser"])
+    with sqlite3.connect(cache_path) as db:
+        db.execute(
+            "UPDATE search_results SET ts = ?",
+            (int(time.time() - part_search.DISK_CACHE_MAX_AGE - 60),))
+    db.close()
+    _client(server.url, cache_path=cache_path).close()
+    with sqlite3.connect(cache_path) as db:
+        count, = db.execute("SELECT COUNT(*) FROM search_results").fetchone()
+    db.close()
+    assert count == 0
+
+
+def test_identical_searches_in_flight_share_one_request(server):
+    server.delay = 0.3
+    with _client(server.url) as client:
+        barrier = threading.Barrier(5)
+        results = []
+
+        def search():
+            barrier.wait()
+            results.append(client.search_parts("1K", suppliers=["mouser"]))
+
+        threads = [threading.Thread(target=search) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert len(server.requests) == 1
+    assert [len(result["Mouser"]) for result in results] == [1] * 5
+    # Every caller gets its own lists
+    assert len({id(result["Mouser"]) for result in results}) == 5
+
+
+def test_batch_search_sends_unique_queries_once(server):
+    queries = [
+        part_search.Query("1K", "0402"),
+        part_search.Query(" "),
+        part_search.Query("2K"),
+        part_search.Query("1K", "0402"),
+    ]
+    with _client(server.url) as client:
+        results = client.search_parts_batch(queries, suppliers=["mouser"])
+    assert [path for path, _ in server.requests] == ["/api/parts-search/batch"]
+    sent = server.requests[0][1]["queries"]
+    assert [query["value"] for query in sent] == ["1K", "2K"]
+    values = [[part.value for part in r.get("Mouser", [])] for r in results]
+    assert values == [["1K"], [], ["2K"], ["1K"]]
+
+
+def test_batch_search_falls_back_to_single_searches(server):
+    server.batch = False
+    queries = [part_search.Query("1K"), part_search.Query("2K")]
+    with _client(server.url) as client:
+        results = client.search_parts_batch(queries, suppliers=["mouser"])
+        assert client._supports_batch is False
+        client.search_parts_batch([part_search.Query("3K")], suppliers=["mouser"])
+    paths = [path for path, _ in server.requests]
+    # The missing batch endpoint is only tried once
+    assert paths.count("/api/parts-search/batch") == 1
+    assert paths.count("/api/parts-search") == 3
+    assert [r["Mouser"][0].value for r in results] == ["1K", "2K"]
+
+
+def test_batch_read_timeout_not_below_single_search(server):
+    timeouts = []
+    with _client(server.url, timeout=(1, 60)) as client:
+        post_search = client._post_search
+
+        def recording_post_search(url, payload, timeout=None):
+            timeouts.append(timeout)
+            return post_search(url, payload, timeout=timeout)
+
+        client._post_search = recording_post_search
+        client.search_parts_batch([part_search.Query("1K")], suppliers=["mouser"])
+    assert timeouts == [(1, 60)]
+
+
+def test_supplier_drill_down_reuses_search_all(server):
+    searcher = part_search.PartSearcher(
+        {"api_base_url": server.url, "no_cache": True}, prewarm=False)
+    with searcher:
+        searcher.search_all("10  uF", "0402", "capacitor")
+        jlcpcb = searcher.search_jlcpcb("10 uF", "0402",
+                                        component_type="capacitor")
+        digikey = searcher.search_digikey("10 uF", "0402", "capacitor")
+        mouser = searcher.search_mouser("10 uF", " 0402", "capacitor")
+    assert len(server.requests) == 1
+    assert server.requests[0][1]["suppliers"] == ["jlcpcb", "digikey", "mouser"]
+    assert [parts[0].supplier for parts in (jlcpcb, digikey, mouser)] == [
+        "JLCPCB", "Digi-Key", "Mouser"]
+
+
+def test_slotted_fallback_matches_dataclass_slots():
+    item = _Slotted("R1", 2)
+    assert _Slotted.__slots__ == ("name", "count")
+    assert not hasattr(item, "__dict__")
+    assert _Slotted("R2").count == 0
+    for change in (
+            lambda: setattr(item, "name", "R2"),
+            lambda: setattr(item, "other", 1),
+            lambda: delattr(item, "name")):
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            change()
+    assert copy.copy(item) == item
+    assert copy.deepcopy(item) == item
+    assert pickle.loads(pickle.dumps(item)) == item
+    assert dataclasses.replace(item, count=3) == _Slotted("R1", 3)
+    assert dataclasses.asdict(item) == {"name": "R1", "count": 2}
+    assert hash(item) == hash(_Slotted("R1", 2))
+
+
+def test_part_search_result_has_no_dict():
+    assert not hasattr(part_search.PartSearchResult(
+        "JLCPCB", "C1", "", "", "", "1K", "0402", 1, 0.1, "USD", "", ""),
+        "__dict__")
+
+
+def test_missing_values_are_searched_by_footprint(server):
+    with _client(server.url) as client:
+        assert client.search_parts(None) == {}
+        results = client.search_parts(None, "0402", suppliers=["mouser"])
+        batch = client.search_parts_batch(
+            [part_search.Query(None, "0402"), part_search.Query(None)],
+            suppliers=["mouser"])
+    assert len(results["Mouser"]) == 1
+    assert [len(r.get("Mouser", [])) for r in batch] == [1, 0]
+    assert server.requests[0][1]["value"] == ""
+
+
+def test_outdated_cache_entries_are_used_offline(server, tmp_path):
+    cache_path = str(tmp_path / "parts.sqlite")
+    with _client(server.url, cache_path=cache_path) as client:
+        client.search_parts("1K", suppliers=["mouser"])
+        client.search_parts_batch([part_search.Query("2K")], suppliers=["mouser"])
+    with sqlite3.connect(cache_path) as db:
+        db.execute(
+            "UPDATE search_results SET ts = ?",
+            (int(time.time() - part_search.DISK_CACHE_TTL - 60),))
+    db.close()
+    server.shutdown()
+    server.server_close()
+    with _client(server.url, cache_path=cache_path) as client:
+        assert client.search_parts("1K", suppliers=["mouser"], no_cache=True) == {}
+        results = client.search_parts("1K", suppliers=["mouser"])
+        batch = client.search_parts_batch(
+            [part_search.Query("2K"), part_search.Query("3K")],
+            suppliers=["mouser"])
+    assert results["Mouser"][0].value == "1K"
+    assert [[part.value for part in r.get("Mouser", [])] for r in batch] == [
+        ["2K"], []]